@@ -22,9 +22,22 @@ try:
     import simplejson as json
 except ImportError:
     import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+import types
+from array import array
+from collections import namedtuple
+from itertools import chain
+try:
+    from functools import lru_cache
+except ImportError:
+    # Python 2
+    def lru_cache(maxsize=128):
+        return lambda function: function
 from datetime import datetime, date
-import dateutil.parser
 
 try:
     long
@@ -38,6 +51,12 @@ except NameError:
     # Python 3
     basestring = unicode = str
 
+try:
+    intern
+except NameError:
+    # Python 3
+    from sys import intern
+
 # XXX Import the geometries from shapely if it is installed
 # or otherwise from Pygeoif
 
@@ -57,14 +76,14 @@ def class_property(cls, name, doc=None):
     variable defined by "_" + name.  Also transparently returns the data()
     method when the object value is requested.
     """
+    hidden_attribute = intern('_' + name)
 
     def getter(self):
-        val = getattr(self, '_' + name)
+        val = getattr(self, hidden_attribute)
         if val is not None:
             return val.data()
 
     def setter(self, val):
-        hidden_attribute = '_' + name
         if isinstance(val, cls):
             setattr(self, hidden_attribute, val)
         elif isinstance(val, dict):
@@ -83,25 +102,100 @@ def class_property(cls, name, doc=None):
 
     return property(getter, setter, doc=doc)
 
-from pytz import utc
+
+try:
+    from ciso8601 import parse_datetime as _ciso8601_parse
+except ImportError:
+    _ciso8601_parse = None
+_fromisoformat = getattr(datetime, 'fromisoformat', None)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso8601(value):
+    """Parse an ISO 8601 date and time string into a datetime, None if
+    value is not in that format.
+    Results are cached, documents tend to repeat the same few epochs
+    and datetimes are immutable.
+    ISO 8601 strings, which is what CZML documents contain, go through
+    ciso8601 if it is installed, else datetime.fromisoformat where
+    available (Python >= 3.7)."""
+    if _ciso8601_parse is not None:
+        try:
+            return _ciso8601_parse(value)
+        except ValueError:
+            pass
+    if _fromisoformat is not None:
+        try:
+            if value.endswith('Z'):
+                return _fromisoformat(value[:-1] + '+00:00')
+            return _fromisoformat(value)
+        except ValueError:
+            pass
+
+
+def _parse_datetime(value):
+    """Parse a date and time string into a datetime.
+    Anything that is not ISO 8601 falls back to dateutil, which is
+    imported on first use only, it is a noticeable part of the import
+    time of this module and is not needed by documents that never hand
+    in dates as strings. Its results are not cached, dateutil fills in
+    missing fields from the current date."""
+    dt = _parse_iso8601(value)
+    if dt is None:
+        import dateutil.parser
+        dt = dateutil.parser.parse(value)
+    return dt
+
+
+@lru_cache(maxsize=4096)
+def _format_iso8601(value):
+    """The isoformat() of an ISO 8601 string, None if value is not in
+    that format."""
+    dt = _parse_iso8601(value)
+    if dt is not None:
+        return dt.isoformat()
+
+
+def _iso_string(value):
+    """The normalised ISO 8601 form of a date and time string, as stored
+    by datetime properties."""
+    iso = _format_iso8601(value)
+    if iso is None:
+        iso = _parse_datetime(value).isoformat()
+    return iso
+
+
+def _time_value(t):
+    """Normalise the time of a sample: None, a date or datetime, or
+    seconds since epoch as a float. Strings may hold either of the
+    latter two."""
+    if t is None or isinstance(t, (date, datetime)):
+        return t
+    elif isinstance(t, (int, long, float)):
+        return float(t)
+    elif isinstance(t, basestring):
+        try:
+            return float(t)
+        except ValueError:
+            return _parse_datetime(t)
+    raise ValueError
+
 
 def datetime_property(name, allow_offset=False, doc=None):
     """Generates a datetime property that handles strings and timezones.
+    Dates are stored as their ISO 8601 string, so they are formatted once
+    when assigned rather than on every read.
     """
-    reserved_name = '_' + name
+    reserved_name = intern('_' + name)
 
     def getter(self):
-        val = getattr(self, reserved_name)
-        if isinstance(val, (date, datetime)):
-            return val.isoformat()
-        elif allow_offset and isinstance(val, (int, long, float)):
-            return val
+        return getattr(self, reserved_name, None)
 
     def setter(self, dt):
         if dt is None:
             setattr(self, reserved_name, None)
         elif isinstance(dt, (date, datetime)):
-            setattr(self, reserved_name, dt)
+            setattr(self, reserved_name, dt.isoformat())
         elif allow_offset and isinstance(dt, (int, long, float)):
             setattr(self, reserved_name, dt)
         elif isinstance(dt, basestring):
@@ -109,21 +203,169 @@ def datetime_property(name, allow_offset=False, doc=None):
                 try:
                     dt = float(dt)
                 except ValueError:
-                    dt = dateutil.parser.parse(dt)
+                    dt = _iso_string(dt)
             else:
-                dt = dateutil.parser.parse(dt)
+                dt = _iso_string(dt)
             setattr(self, reserved_name, dt)
         else:
             raise ValueError
 
     return property(getter, setter, doc=doc)
 
+
+def _dumps(obj, **kwargs):
+    """Serialize obj to a JSON string.
+    orjson is used when it is installed and no encoder options are given,
+    options like indent or sort_keys need the json module. orjson writes
+    compact separators, unescaped non-ASCII text and NaN or Infinity as
+    null, see the README."""
+    if orjson is None or kwargs:
+        return json.dumps(obj, **kwargs)
+    return orjson.dumps(obj).decode('utf-8')
+
+
+if orjson is not None:
+    def _loads(data):
+        """Deserialize the JSON string data.
+        orjson rejects the NaN and Infinity literals the json module
+        writes, documents containing them are read with the json module."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+else:
+    _loads = json.loads
+
 # Many classes will have material and position properties.
 material_property = lambda x: class_property(Material, x)
 position_property = lambda x: class_property(Position, x)
 
 
-class _CZMLBaseObject(object):
+def _data_source(fields):
+    """Source of a data() method that reads each of *fields* in turn,
+    skipping None values, with the same semantics as
+    _CZMLBaseObject.data().
+    """
+    lines = ['def data(self):', '    d = {}']
+    for field in fields:
+        lines += ['    a = self.%s' % field,
+                  '    if a is not None:',
+                  '        if isinstance(a, (_CZMLBaseObject, _Colors,',
+                  '                          _Coordinates, _Positions)):',
+                  '            d[%r] = a.data()' % field,
+                  '        else:',
+                  '            d[%r] = a' % field]
+    lines.append('    return d')
+    return '\n'.join(lines) + '\n'
+
+
+def _init_source(positional, fields):
+    """Source of an __init__() method taking each of *fields* as an
+    argument and assigning it. The names in *positional* come first and
+    may be passed by position, all others are keyword only. Unknown
+    keywords raise a ValueError, like _CZMLBaseObject.load() does."""
+    params = ['%s=None' % field for field in fields if field in positional]
+    keywords = ['%s=None' % field for field in fields
+                if field not in positional]
+    if keywords:
+        params += ['*'] + keywords
+    lines = ['def __init__(self, %s, **kwargs):' % ', '.join(params),
+             '    if kwargs:',
+             "        raise ValueError('Unknown parameters: %s' %",
+             "                         ', '.join(sorted(kwargs)))"]
+    lines += ['    self.%s = %s' % (field, field) for field in fields]
+    return '\n'.join(lines) + '\n'
+
+
+def _make_method(name, source, fields):
+    """Compile the method *name* generated by *source* for *fields*.
+    This runs once per class when the module is imported."""
+    namespace = {}
+    exec(source(fields), globals(), namespace)
+    return namespace[name]
+
+
+def autodata(cls):
+    """Class decorator replacing the table driven data() method of *cls*
+    with straight-line code generated from ``cls._properties``.
+
+    The field list is fixed when the decorator runs, so only decorate
+    classes that are not subclassed any further.
+    """
+    method = _make_method('data', _data_source, cls._properties)
+    method.__qualname__ = '%s.data' % cls.__name__
+    cls.data = method
+    return cls
+
+
+def autoinit(cls):
+    """Class decorator giving *cls* a generated __init__() with one
+    keyword only argument per name in ``cls._properties``, assigned with
+    straight-line code. The names in ``cls._init_positional`` may be
+    passed by position as well, in that order.
+
+    Plain class attributes keep their value as the default, properties
+    and slots default to None.
+    """
+    fields = cls._properties
+    positional = getattr(cls, '_init_positional', ())
+    defaults = {}
+    for field in fields:
+        default = getattr(cls, field, None)
+        if isinstance(default, (property, types.MemberDescriptorType)):
+            default = None
+        defaults[field] = default
+    try:
+        method = _make_method('__init__',
+                              lambda fields: _init_source(positional, fields),
+                              fields)
+    except SyntaxError:
+        # Python 2 has no keyword only arguments, map the positional
+        # arguments to keywords for the inherited __init__(**kwargs)
+        inherited = cls.__init__
+
+        def method(self, *args, **kwargs):
+            if len(args) > len(positional):
+                raise TypeError('%s() takes at most %d positional arguments'
+                                % (cls.__name__, len(positional)))
+            for field, value in zip(positional, args):
+                if field in kwargs:
+                    raise TypeError('%s() got multiple values for %s'
+                                    % (cls.__name__, field))
+                kwargs[field] = value
+            inherited(self, **kwargs)
+        cls.__init__ = method
+        return cls
+    method.__defaults__ = tuple(defaults[field] for field in fields
+                                if field in positional) or None
+    method.__kwdefaults__ = dict((field, defaults[field]) for field in fields
+                                 if field not in positional) or None
+    method.__qualname__ = '%s.__init__' % cls.__name__
+    cls.__init__ = method
+    return cls
+
+
+class _SlotsPickleMixin(object):
+    """Pickle support for classes with __slots__, pickle protocols 0 and 1
+    refuse to pickle them without __getstate__()."""
+    __slots__ = ()
+
+    def __getstate__(self):
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if (name not in ('__dict__', '__weakref__') and
+                        hasattr(self, name)):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class _CZMLBaseObject(_SlotsPickleMixin):
+    __slots__ = ()
     _properties = ()
 
     def __init__(self, **kwargs):
@@ -136,12 +378,25 @@ class _CZMLBaseObject(object):
         return self._properties
 
     def write(self, filename):
+        """Write the JSON to filename, which may also be an open text
+        file or other file like object."""
+        if hasattr(filename, 'write'):
+            filename.write(_dumps(list(self.data())))
+            return
+        if orjson is not None:
+            # orjson encodes straight to UTF-8 bytes, write those as they
+            # are instead of decoding them to a str first
+            with open(filename, 'wb') as outfile:
+                outfile.write(orjson.dumps(list(self.data())))
+            return
+        # A single dumps() call runs in the C encoder, json.dump() would
+        # fall back to the pure Python iterencode.
         with open(filename, 'w') as outfile:
-            json.dump(list(self.data()), outfile)
+            outfile.write(_dumps(list(self.data())))
 
     def dumps(self, **kwargs):
         d = self.data()
-        return json.dumps(d, **kwargs)
+        return _dumps(d, **kwargs)
 
     def data(self):
         d = {}
@@ -157,18 +412,13 @@ class _CZMLBaseObject(object):
         return d
 
     def loads(self, data):
-        packets = json.loads(data)
+        packets = _loads(data)
         self.load(packets)
 
     def load(self, data):
-        if hasattr(data, 'iteritems'):
-            # python 2
-            iterator = data.iteritems
-        elif hasattr(data, 'items'):
-            # python 3
-            iterator = data.items
-        for k, v in iterator():
-            if k in self.properties:
+        properties = self.properties
+        for k, v in data.items():
+            if k in properties:
                 setattr(self, k, v)
             else:
                 raise ValueError
@@ -195,7 +445,50 @@ class CZML(_CZMLBaseObject):
 
     def dumps(self, **kwargs):
         d = list(self.data())
-        return json.dumps(d, **kwargs)
+        return _dumps(d, **kwargs)
+
+    def dump(self, fp, **kwargs):
+        """Write the document to the file like object fp.
+        Packets are encoded and written one at a time, so the JSON text
+        of the whole document is never held in memory at once."""
+        if kwargs.get('indent') is not None:
+            # indented output also lays out the array itself, leave that
+            # to the encoder
+            fp.write(self.dumps(**kwargs))
+            return
+        # match the array separator of dumps()
+        separators = kwargs.get('separators')
+        if separators is not None:
+            separator = separators[0]
+        elif orjson is not None and not kwargs:
+            separator = ','
+        else:
+            separator = ', '
+        fp.write('[')
+        for i, packet in enumerate(self.packets):
+            if i:
+                fp.write(separator)
+            fp.write(_dumps(packet.data(), **kwargs))
+        fp.write(']')
+
+    def write(self, filename):
+        """Write the document to filename, which may also be an open text
+        file or other file like object."""
+        if hasattr(filename, 'write'):
+            self.dump(filename)
+            return
+        if orjson is not None:
+            # same layout as dump(), but keeping orjson's UTF-8 bytes
+            with open(filename, 'wb') as outfile:
+                outfile.write(b'[')
+                for i, packet in enumerate(self.packets):
+                    if i:
+                        outfile.write(b',')
+                    outfile.write(orjson.dumps(packet.data()))
+                outfile.write(b']')
+            return
+        with open(filename, 'w') as outfile:
+            self.dump(outfile)
 
     def load(self, data):
         self.packets = []
@@ -215,9 +508,7 @@ class CZML(_CZMLBaseObject):
 class _DateTimeAware(_CZMLBaseObject):
     """ A baseclass for Date time aware objects """
 
-    _epoch = None
-    _nextTime = None
-    _previousTime = None
+    __slots__ = ('_epoch', '_nextTime', '_previousTime')
     _properties = ('epoch', 'nextTime', 'previousTime')
 
     epoch = datetime_property('epoch', doc=
@@ -235,95 +526,162 @@ class _DateTimeAware(_CZMLBaseObject):
         specified in different packets.""")
 
 
-class _Coordinate(object):
+class _Coordinate(namedtuple('_Coordinate', 'x y z t')):
     """ [Longitude, Latitude, Height] or [X, Y, Z] or
     [Time, Longitude, Latitude, Height] or [Time, X, Y, Z]
+
+    An immutable value, coordinates are replaced, never modified.
     """
-    x = y = z = 0
-    t = None
-
-    def __init__(self, x, y=None, z=0, t=None):
-        self.x = float(x)
-        self.y = float(y)
-        self.z = float(z)
-        if t is None:
-            self.t = None
-        elif isinstance(t, (date, datetime)):
-            self.t = t
-        elif isinstance(t, (int, long, float)):
-            self.t = float(t)
-        elif isinstance(t, basestring):
-            try:
-                self.t = float(t)
-            except ValueError:
-                self.t = dateutil.parser.parse(t)
-        else:
-            raise ValueError
+    __slots__ = ()
+
+    def __new__(cls, x, y=None, z=0, t=None):
+        return super(_Coordinate, cls).__new__(
+            cls, float(x), float(y), float(z), _time_value(t))
+
+
+# pygeoif geometries czml reads coordinates from
+_GEOMETRIES = (geometry.Point, geometry.LineString, geometry.LinearRing,
+               geometry.Polygon)
 
 
-class _Coordinates(object):
+def _as_shape(obj):
+    """asShape(obj), except that pygeoif geometries are used as they are
+    rather than being rebuilt from their __geo_interface__."""
+    if isinstance(obj, _GEOMETRIES):
+        return obj
+    return asShape(obj)
 
-    coords = None
+
+class _Coordinates(_SlotsPickleMixin):
+    """ A sequence of coordinate samples.
+    The samples are stored column wise, x, y and z in packed arrays of
+    doubles and the times in a list, instead of one object per sample.
+    """
+
+    # x, y, z, t columns, then the samples as read from coords and the
+    # flattened samples of data(), both built on first use
+    __slots__ = ('_x', '_y', '_z', '_t', '_coords', '_data')
 
     def __init__(self, coords):
+        samples = None
         if isinstance(coords, (list, tuple)):
             try:
                 float(coords[1])
                 if len(coords) < 3:
-                    self.coords = [_Coordinate(coords[0], coords[1])]
+                    samples = [_Coordinate(coords[0], coords[1])]
                 elif len(coords) < 4:
-                    self.coords = [_Coordinate(coords[0], coords[1], coords[2])]
-                elif len(coords) == 4:
-                    self.coords = [_Coordinate(coords[1], coords[2], coords[3], coords[0])]
-                elif len(coords) >= 4:
-                    self.coords = []
-                    for coord in grouper(coords, 4):
-                        self.coords.append(_Coordinate(coord[1], coord[2],
-                                                coord[3], coord[0]))
+                    samples = [_Coordinate(coords[0], coords[1], coords[2])]
+                else:
+                    # [Time, X, Y, Z, ...]: slice the flat list straight
+                    # into columns, no object per sample
+                    if len(coords) % 4:
+                        raise ValueError('Time-tagged coordinates need '
+                                         'four values per sample')
+                    self._set_columns(coords[1::4], coords[2::4],
+                                      coords[3::4], coords[0::4])
+                    return
             except TypeError:
-                self.coords = []
+                samples = []
                 for coord in grouper(coords, 2):
-                    geom = asShape(coord[1])
+                    geom = _as_shape(coord[1])
                     assert(isinstance(geom, geometry.Point))
-                    self.coords.append(_Coordinate(*geom.coords[0], t=coord[0]))
+                    samples.append(_Coordinate(*geom.coords[0], t=coord[0]))
         else:
-            geom = asShape(coords)
+            geom = _as_shape(coords)
             if isinstance(geom, geometry.Point):
-                self.coords = [_Coordinate(*geom.coords[0])]
+                samples = [_Coordinate(*geom.coords[0])]
+        self.coords = samples
+
+    @property
+    def coords(self):
+        """ The samples as a tuple of _Coordinate, built on first access.
+        The tuple is read only, assign to coords to change the samples. """
+        if self._coords is None and self._x is not None:
+            self._coords = tuple(map(_Coordinate._make,
+                                     zip(self._x, self._y, self._z, self._t)))
+        return self._coords
+
+    @coords.setter
+    def coords(self, samples):
+        if samples is None:
+            self._x = self._y = self._z = self._t = None
+            self._coords = self._data = None
+        else:
+            samples = list(samples)
+            self._set_columns([c.x for c in samples], [c.y for c in samples],
+                              [c.z for c in samples], [c.t for c in samples])
+
+    def _set_columns(self, x, y, z, t):
+        self._x = array('d', map(float, x))
+        self._y = array('d', map(float, y))
+        self._z = array('d', map(float, z))
+        self._t = list(map(_time_value, t))
+        self._coords = self._data = None
 
     def data(self):
-        d = []
-        if self.coords:
-            for coord in self.coords:
-                if isinstance(coord.t, (date, datetime)):
-                     d.append(coord.t.isoformat())
-                elif coord.t is None:
-                    pass
+        if self._data is None:
+            d = []
+            if self._x is not None:
+                times = self._t
+                untimed = times.count(None)
+                if untimed == 0 or untimed == len(times):
+                    # interleave whole columns with extended slices
+                    columns = [self._x.tolist(), self._y.tolist(),
+                               self._z.tolist()]
+                    if untimed == 0:
+                        columns.insert(0, self._time_column(times))
+                    step = len(columns)
+                    d = [None] * (step * len(times))
+                    for i, column in enumerate(columns):
+                        d[i::step] = column
                 else:
-                    d.append(coord.t)
-                d.append(coord.x)
-                d.append(coord.y)
-                d.append(coord.z)
-        return d
+                    for t, x, y, z in zip(times, self._x, self._y, self._z):
+                        if isinstance(t, (date, datetime)):
+                            d.append(t.isoformat())
+                        elif t is not None:
+                            d.append(t)
+                        d.append(x)
+                        d.append(y)
+                        d.append(z)
+            self._data = d
+        return list(self._data)
+
+    @staticmethod
+    def _time_column(times):
+        """ The times as written to JSON. Samples parsed from the same
+        string share one datetime object, so each object is formatted
+        only once. """
+        formatted = {}
+        column = []
+        for t in times:
+            if isinstance(t, (date, datetime)):
+                key = id(t)
+                iso = formatted.get(key)
+                if iso is None:
+                    iso = formatted[key] = t.isoformat()
+                t = iso
+            column.append(t)
+        return column
 
 
 class Number(_DateTimeAware):
     """Represents numbers"""
     number = None
+    _properties = _DateTimeAware._properties + ('number',)
 
     def __init__(self, number=number, **kwargs):
-        self._properties += ('number',)
         super(Number, self).__init__(number=number, **kwargs)
 
     def data(self):
         data = super(Number, self).data()
-        if (('number' in data) and (len(data.keys()) == 1) and
+        if (('number' in data) and (len(data) == 1) and
             isinstance(data['number'], (int, float, str, long))):
             return data['number']
-        return super(Number, self).data()
+        return data
 
 
 
+@autodata
 class Position(_DateTimeAware):
     """ The position of the object in the world. The position has no
     direct visual representation, but it is used to locate billboards,
@@ -338,18 +696,21 @@ class Position(_DateTimeAware):
     # This property is ignored when specifying position with any type other
     # than cartesian. If this property is not specified,
     # the default reference frame is "FIXED".
-    referenceFrame = None
+    __slots__ = ('referenceFrame', '_cartesian', '_cartographicRadians',
+                 '_cartographicDegrees', 'interpolationAlgorithm',
+                 'interpolationDegree')
 
-    _cartesian = None
-    _cartographicRadians = None
-    _cartographicDegrees = None
-    interpolationAlgorithm = None
-    interpolationDegree = None
+    _properties = _DateTimeAware._properties + (
+        'cartesian', 'cartographicRadians', 'cartographicDegrees',
+        'interpolationAlgorithm', 'interpolationDegree', 'referenceFrame')
 
     def __init__(self, **kwargs):
-        self._properties += ('cartesian', 'cartographicRadians',
-                             'cartographicDegrees', 'interpolationAlgorithm',
-                             'interpolationDegree', 'referenceFrame')
+        self.referenceFrame = None
+        self._cartesian = None
+        self._cartographicRadians = None
+        self._cartographicDegrees = None
+        self.interpolationAlgorithm = None
+        self.interpolationDegree = None
         super(Position, self).__init__(**kwargs)
 
     @property
@@ -410,6 +771,7 @@ class Position(_DateTimeAware):
             self._cartographicRadians = None
 
 
+@autodata
 class Radii(_DateTimeAware):
     """ Radii is in support of ellipsoids.  This class is nearly an identical
     copy of the Position class since its behavior is almost the same.
@@ -427,9 +789,7 @@ class Radii(_DateTimeAware):
     referenceFrame = None
     _cartesian = None
 
-    def __init__(self, **kwargs):
-        self._properties += ('cartesian', 'referenceFrame')
-        super(_DateTimeAware, self).__init__(**kwargs)
+    _properties = _DateTimeAware._properties + ('cartesian', 'referenceFrame')
 
     @property
     def cartesian(self):
@@ -453,32 +813,28 @@ class Radii(_DateTimeAware):
         super(Radii, self).load(data)
         self.cartesian = data.get('cartesian', None)
 
-class _Color(object):
-    r = g = b = a = 0
-    t = None
-
-    def __init__(self, r, g, b, a=1, t=None, num=float):
-        self.r = num(r)
-        self.g = num(g)
-        self.b = num(b)
-        self.a = num(a)
-        if t is None:
-            self.t = None
-        elif isinstance(t, (date, datetime)):
-            self.t = t
-        elif isinstance(t, (int, long, float)):
-            self.t = float(t)
-        elif isinstance(t, basestring):
-            try:
-                self.t = float(t)
-            except ValueError:
-                self.t = dateutil.parser.parse(t)
-        else:
-            raise ValueError
+class _Color(namedtuple('_Color', 'r g b a t')):
+    """ A single, optionally time-tagged, color sample.
+    An immutable value, colors are replaced, never modified.
+    """
+    __slots__ = ()
+
+    def __new__(cls, r, g, b, a=1, t=None, num=float):
+        return super(_Color, cls).__new__(
+            cls, num(r), num(g), num(b), num(a), _time_value(t))
+
+    def __getnewargs__(self):
+        # keep integer components integers when copied or unpickled
+        return tuple(self) + (type(self.r),)
+
 
+# Documents tend to use the same few constant colors over and over,
+# share one sample per distinct color instead of building a new one.
+_constant_color = lru_cache(maxsize=256)(_Color)
 
 
-class _Colors(object):
+
+class _Colors(_SlotsPickleMixin):
     """ The color specified as an array of color components
     [Red, Green, Blue, Alpha].
     If the array has four elements, the color is constant.
@@ -486,53 +842,64 @@ class _Colors(object):
     [Time, Red, Green, Blue, Alpha, Time, Red, Green, Blue, Alpha, ...],
     where Time is an ISO 8601 date and time string or seconds since epoch.
     """
-    colors = None
+    # the samples and the (colors, data) of the last call to data()
+    __slots__ = ('colors', '_data')
 
     def __init__(self, colors, num=float):
+        self._data = None
         if isinstance(colors, (list, tuple)):
-            if len(colors) == 3:
-                self.colors = [_Color(colors[0], colors[1], colors[2], num=num)]
-            elif len(colors) == 4:
-                self.colors = [_Color(colors[0], colors[1], colors[2], colors[3], num=num)]
-            elif len(colors) == 5:
-                self.colors = [_Color(colors[1], colors[2], colors[3], colors[4], colors[0], num=num)]
-            elif len(colors) >= 5:
-                self.colors = []
-                for color in grouper(colors, 5):
-                    self.colors.append(_Color(color[1], color[2],
-                                            color[3], color[4] , color[0], num=num))
+            # constant [R, G, B, A] colors are by far the most common input
+            n = len(colors)
+            if n == 4:
+                self.colors = [_constant_color(colors[0], colors[1], colors[2], colors[3], num=num)]
+            elif n == 3:
+                self.colors = [_constant_color(colors[0], colors[1], colors[2], num=num)]
+            elif n >= 5 and n % 5 == 0:
+                # [Time, R, G, B, A, ...]: one strided slice per component
+                self.colors = [
+                    _Color(r, g, b, a, t, num) for t, r, g, b, a in
+                    zip(colors[0::5], colors[1::5], colors[2::5],
+                        colors[3::5], colors[4::5])]
             else:
                 raise ValueError
         elif colors is None:
             self.colors = None
         else:
             raise ValueError
+        if self.colors is not None:
+            self.colors = tuple(self.colors)
 
     def data(self):
-        d = []
-        if self.colors:
-            for color in self.colors:
-                if isinstance(color.t, (date, datetime)):
-                     d.append(color.t.isoformat())
-                elif color.t is None:
-                    pass
-                else:
-                    d.append(color.t)
-                d.append(color.r)
-                d.append(color.g)
-                d.append(color.b)
-                d.append(color.a)
-        return d
+        cached = self._data
+        if cached is None or cached[0] is not self.colors:
+            d = []
+            if self.colors:
+                for color in self.colors:
+                    if isinstance(color.t, (date, datetime)):
+                         d.append(color.t.isoformat())
+                    elif color.t is None:
+                        pass
+                    else:
+                        d.append(color.t)
+                    d.append(color.r)
+                    d.append(color.g)
+                    d.append(color.b)
+                    d.append(color.a)
+            cached = self._data = (self.colors, d)
+        return list(cached[1])
 
 
+@autodata
 class Color(_DateTimeAware):
 
-    _rgba = None
-    _rgbaf = None
+    __slots__ = ('_rgba', '_rgbaf')
+
+    _properties = _DateTimeAware._properties + ('rgba', 'rgbaf')
 
     def __init__(self, **kwargs):
-        self._properties += ('rgba', 'rgbaf')
-        super(_DateTimeAware, self).__init__(**kwargs)
+        self._rgba = None
+        self._rgbaf = None
+        super(Color, self).__init__(**kwargs)
 
     @property
     def rgba(self):
@@ -609,18 +976,7 @@ class Scale(_DateTimeAware):
             if len(data) > 1:
                 for d in grouper(data, 2):
                     v = float(d[1])
-                    t = d[0]
-                    if isinstance(t, (date, datetime)):
-                       t = t
-                    elif isinstance(t, (int, long, float)):
-                        t = float(t)
-                    elif isinstance(t, basestring):
-                        try:
-                            t = float(t)
-                        except ValueError:
-                            t = dateutil.parser.parse(t)
-                    else:
-                        raise ValueError
+                    t = _time_value(d[0])
                     self._number.append((t, v))
             else:
                 self._number = float(data[0])
@@ -633,29 +989,32 @@ class Scale(_DateTimeAware):
             d['number'] = self.number
         return d
 
+@autodata
 class Billboard(_CZMLBaseObject):
     """A billboard, or viewport-aligned image. The billboard is positioned
     in the scene by the position property.
     A billboard is sometimes called a marker."""
 
-    # Whether or not the billboard is shown.
-    show = None
-
-    # The image displayed on the billboard, expressed as a URL.
-    # For broadest client compatibility, the URL should be accessible
-    # via Cross-Origin Resource Sharing (CORS).
-    # The URL may also be a data URI.
-    image = None
-
-    _color = None
-
-    scale = None
+    __slots__ = (
+        # Whether or not the billboard is shown.
+        'show',
+        # The image displayed on the billboard, expressed as a URL.
+        # For broadest client compatibility, the URL should be accessible
+        # via Cross-Origin Resource Sharing (CORS).
+        # The URL may also be a data URI.
+        'image',
+        'color',
+        'scale',
+    )
 
     _properties = ('show','image','color','scale')
 
+    def __init__(self, **kwargs):
+        self.show = self.image = self.color = self.scale = None
+        super(Billboard, self).__init__(**kwargs)
 
 
-
+@autodata
 class Clock(_CZMLBaseObject):
     """The clock settings for the entire data set.
        Only valid on the document object."""
@@ -669,12 +1028,14 @@ class Clock(_CZMLBaseObject):
     _properties = ('currentTime', 'multiplier', 'interval', 'range', 'step',)
 
 
-class _Positions(object):
-    """ The list of positions [X, Y, Z, X, Y, Z, ...] """
+class _Positions(_SlotsPickleMixin):
+    """ The list of positions [X, Y, Z, X, Y, Z, ...]
+    kept as a packed array of doubles, data() unpacks it into a list. """
 
-    coords = None
+    __slots__ = ('coords',)
 
     def __init__(self, coords):
+        self.coords = None
         if isinstance(coords, (list, tuple)):
             assert(len(coords) % 3 == 0)
             assert(len(coords) >= 6)
@@ -683,25 +1044,30 @@ class _Positions(object):
                     continue
                 else:
                     raise ValueError
-            self.coords = coords
+            self.coords = array('d', coords)
         else:
-            geom = asShape(coords)
+            geom = _as_shape(coords)
             if isinstance(geom, geometry.Polygon):
                 geom = geom.exterior
             if isinstance(geom, (geometry.LineString, geometry.LinearRing)):
-                self.coords = []
-                for coord in geom.coords:
-                    if len(coord) == 2:
-                        self.coords += [coord[0], coord[1], 0]
-                    elif len(coord) == 3:
-                        self.coords += coord
-                    else:
-                        raise ValueError
+                # pygeoif guarantees all vertices have the same dimension,
+                # so flatten in one pass padding 2D vertices with a height
+                # of 0
+                coords = geom.coords
+                if len(coords[0]) == 3:
+                    self.coords = array('d', chain.from_iterable(coords))
+                elif len(coords[0]) == 2:
+                    self.coords = array('d', chain.from_iterable(
+                        (x, y, 0) for x, y in coords))
+                else:
+                    raise ValueError
 
     def data(self):
-        return self.coords
+        if self.coords is not None:
+            return self.coords.tolist()
 
 
+@autodata
 class Positions(_CZMLBaseObject):
     """The world-space positions of vertices.
     The vertex positions have no direct visual representation, but they
@@ -728,6 +1094,8 @@ class Positions(_CZMLBaseObject):
     _cartographicRadians = None
     _cartographicDegrees = None
 
+    _properties = ('cartographicDegrees', 'cartographicRadians', 'cartesian',
+                   'references')
 
     def __init__(self, referenceFrame=None,
             cartesian=None, cartographicRadians=None,
@@ -791,20 +1159,8 @@ class Positions(_CZMLBaseObject):
         self.cartesian = data.get('cartesian', None)
 
 
-    def data(self):
-        d = {}
-        if self.cartographicDegrees:
-            d['cartographicDegrees'] = self.cartographicDegrees.data()
-        if self.cartographicRadians:
-            d['cartographicRadians'] = self.cartographicRadians.data()
-        if self.cartesian:
-            d['cartesian'] = self.cartesian.data()
-        if self.references:
-            d["references"] = self.references
-        return d
-
-
 
+@autodata
 class Orientation(_DateTimeAware):
     """The orientation of the object in the world.
     The orientation has no direct visual representation, but it is used
@@ -821,25 +1177,24 @@ class Orientation(_DateTimeAware):
     interpolationAlgorithm = None
     interpolationDegree = None
 
-    def __init__(self, **kwargs):
-        self._properties += ('axes', 'unitQuaternion',
-                             'interpolationAlgorithm', 'interpolationDegree')
-        super(Orientation, self).__init__(**kwargs)
+    _properties = _DateTimeAware._properties + (
+        'axes', 'unitQuaternion', 'interpolationAlgorithm',
+        'interpolationDegree')
 
 
 class Point(_CZMLBaseObject):
     """A point, or viewport-aligned circle.
     The point is positioned in the scene by the position property. """
 
-    show = False
-    _color = None
-    _outlineColor = None
-
-    # The width of the outline of the point.
-    outlineWidth = None
-
-    # The size of the point, in pixels.
-    pixelSize = None
+    __slots__ = (
+        'show',
+        '_color',
+        '_outlineColor',
+        # The width of the outline of the point.
+        'outlineWidth',
+        # The size of the point, in pixels.
+        'pixelSize',
+    )
 
     def __init__(self, show=False, color=None, pixelSize=None,
                 outlineColor=None, outlineWidth=None):
@@ -893,10 +1248,8 @@ class Point(_CZMLBaseObject):
 
     def data(self):
         d = {}
-        if self.show:
-            d['show'] = True
-        if self.show == False:
-            d['show'] = False
+        if self.show is not None:
+            d['show'] = bool(self.show)
         if self.color:
             d['color'] = self.color
         if self.pixelSize:
@@ -921,23 +1274,21 @@ class Label(_CZMLBaseObject):
     """ A string of text.
     The label is positioned in the scene by the position property."""
 
-    text = None
-    show = False
-    horizontalOrigin = None
-    scale = None
-    pixelOffset = None
-    fillColor = None
+    __slots__ = ('text', 'show', 'horizontalOrigin', 'scale', 'pixelOffset',
+                 'fillColor')
 
     def __init__(self, text=None, show=False):
         self.text = text
         self.show = show
+        self.horizontalOrigin = None
+        self.scale = None
+        self.pixelOffset = None
+        self.fillColor = None
 
     def data(self):
         d = {}
-        if self.show:
-            d['show'] = True
-        if self.show == False:
-            d['show'] = False
+        if self.show is not None:
+            d['show'] = bool(self.show)
         if self.text:
             d['text'] = self.text
         if self.horizontalOrigin:
@@ -955,6 +1306,7 @@ class Label(_CZMLBaseObject):
         self.text = data.get('text', None)
 
 
+@autodata
 class Grid(_CZMLBaseObject):
     """Fills the surface with a grid."""
     _color = None
@@ -965,6 +1317,7 @@ class Grid(_CZMLBaseObject):
     _properties = ('color', 'cellAlpha', 'lineCount', 'lineThickness', 'lineOffset',)
 
 
+@autodata
 class Image(_CZMLBaseObject):
     """Fills the surface with an image."""
     _image = None
@@ -972,6 +1325,7 @@ class Image(_CZMLBaseObject):
     _properties = ('image', 'repeat',)
 
 
+@autodata
 class Stripe(_CZMLBaseObject):
     """Fills the surface with alternating colors."""
     _orientation = None
@@ -982,12 +1336,14 @@ class Stripe(_CZMLBaseObject):
     _properties = ('orientation', 'evenColor', 'oddColor', 'offset', 'repeat',)
 
 
+@autodata
 class SolidColor(_CZMLBaseObject):
     """Fills the surface with a solid color, which may be translucent."""
     _color = None
     _properties = ('color',)
 
 
+@autodata
 class PolylineGlow(_CZMLBaseObject):
     """Colors the line with a glowing color."""
     _color = None
@@ -995,6 +1351,7 @@ class PolylineGlow(_CZMLBaseObject):
     _properties = ('color', 'glowPower',)
 
 
+@autodata
 class PolylineOutline(_CZMLBaseObject):
     """Colors the line with a color and outline."""
     _color = None
@@ -1003,17 +1360,23 @@ class PolylineOutline(_CZMLBaseObject):
     _properties = ('color', 'outlineColor', 'outlineWidth',)
 
 
+@autodata
 class Material(_CZMLBaseObject):
     """The material to use to fill the polygon."""
-    _grid = None
-    _image = None
-    _stripe = None
-    _solidColor = None
-    _polylineGlow = None
-    _polylineOutline = None
+    __slots__ = ('_grid', '_image', '_stripe', '_solidColor',
+                 '_polylineGlow', '_polylineOutline')
 
     _properties = ('grid', 'image', 'stripe', 'solidColor', 'polylineGlow', 'polylineOutline')
 
+    def __init__(self, **kwargs):
+        self._grid = None
+        self._image = None
+        self._stripe = None
+        self._solidColor = None
+        self._polylineGlow = None
+        self._polylineOutline = None
+        super(Material, self).__init__(**kwargs)
+
     grid = class_property(Grid, 'grid',
                           doc="""Fills the surface with a grid.
                           """)
@@ -1034,6 +1397,8 @@ class Material(_CZMLBaseObject):
                                      """)
 
 
+@autoinit
+@autodata
 class Path(_DateTimeAware, _CZMLBaseObject):
     """A path, which is a polyline defined by the motion of an object over
     time. The possible vertices of the path are specified by the position
@@ -1062,6 +1427,7 @@ class Path(_DateTimeAware, _CZMLBaseObject):
                    'resolution', 'material', 'position')
 
 
+@autodata
 class Polyline(_DateTimeAware, _CZMLBaseObject):
     """ A polyline, which is a line in the scene composed of multiple segments.
     """
@@ -1080,6 +1446,7 @@ class Polyline(_DateTimeAware, _CZMLBaseObject):
     _properties = ('show', 'followSurface', 'width', 'material', 'positions')
 
 
+@autodata
 class Polygon(_DateTimeAware, _CZMLBaseObject):
     """A polygon, which is a closed figure on the surface of the Earth.
     """
@@ -1120,6 +1487,7 @@ class Polygon(_DateTimeAware, _CZMLBaseObject):
                    'closeTop', 'closeBottom')
 
 
+@autodata
 class Ellipse(_DateTimeAware, _CZMLBaseObject):
     """An ellipse, which is a closed curve on the surface of the Earth.
        The ellipse is positioned using the position property.
@@ -1169,30 +1537,22 @@ class Ellipse(_DateTimeAware, _CZMLBaseObject):
                    'numberOfVerticalLines', 'outlineColor', 'outlineWidth', 'material', 'position')
 
 
+@autodata
 class Ellipsoid(_DateTimeAware):
     show = True
     _radii = None
     _material = None
 
+    _properties = _DateTimeAware._properties + ('show', 'material', 'radii')
+
     material = material_property('material')
     radii = class_property(Radii, 'radii')
 
-    def data(self):
-        d = super(Ellipsoid, self).data()
-
-        for attr in ('show', 'material', 'radii'):
-            a = getattr(self, attr)
-            if a is not None:
-                if isinstance(a, _CZMLBaseObject):
-                    d[attr] = a.data()
-                else:
-                    d[attr] = a
-        return d
-
     def load(self, data):
         self.material = data.get('material', None)
         self.radii = data.get('radii', None)
 
+@autoinit
 class Cone(_DateTimeAware, _CZMLBaseObject):
     """ A cone starts at a point or apex and extends in a circle of
     directions which all have the same angular separation from the Z-axis
@@ -1224,22 +1584,15 @@ class Cone(_DateTimeAware, _CZMLBaseObject):
     outerMaterial = material_property('outerMaterial')
     silhouetteMaterial = material_property('silhouetteMaterial')
 
-    def __init__(self, epoch=None, nextTime=None, previousTime=None, **kwargs):
-
-        _DateTimeAware.__init__(self, epoch=epoch,
-                                nextTime=nextTime,
-                                previousTime=previousTime)
+    # Cone(epoch, nextTime, previousTime) has always been accepted
+    _init_positional = _DateTimeAware._properties
 
-        self._properties += ('show', 'innerHalfAngle', 'outerHalfAngle', 'radius',
-                             'minimumClockAngle', 'maximumClockAngle',
-                             'showIntersection', 'intersectionColor',
-                             'capMaterial', 'innerMaterial', 'outerMaterial',
-                             'silhouetteMaterial')
-        for param in kwargs:
-            if param in self._properties:
-                setattr(self, param, kwargs[param])
-            else:
-                raise ValueError('Unknown parameter: %s', param)
+    _properties = _DateTimeAware._properties + (
+        'show', 'innerHalfAngle', 'outerHalfAngle', 'radius',
+        'minimumClockAngle', 'maximumClockAngle',
+        'showIntersection', 'intersectionColor',
+        'capMaterial', 'innerMaterial', 'outerMaterial',
+        'silhouetteMaterial')
 
     def data(self):
         d = _DateTimeAware.data(self)
@@ -1267,6 +1620,7 @@ class Camera(_CZMLBaseObject):
     """A camera."""
     pass
 
+@autodata
 class CZMLPacket(_CZMLBaseObject):
     """  A CZML packet describes the graphical properties for a single
     object in the scene, such as a single aircraft.
@@ -1652,14 +2006,6 @@ class CZMLPacket(_CZMLBaseObject):
         else:
             raise TypeError
 
-    def data(self):
-        d = {}
-        for property_name in self._properties:
-            property_value = getattr(self, property_name)
-            if property_value is not None:
-                d[property_name] = property_value
-        return d
-
     def load(self, data):
         for property_name in self._properties:
             property_value = data.get(property_name, None)
@@ -1667,6 +2013,7 @@ class CZMLPacket(_CZMLBaseObject):
                 setattr(self, property_name, property_value)
 
 
+@autodata
 class Model(_CZMLBaseObject):
     """A 3D model. Based on https://github.com/AnalyticalGraphicsInc/czml-writer/wiki/Model """
 
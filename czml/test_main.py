@@ -15,11 +15,18 @@
 #    License along with this library; if not, write to the Free Software
 #    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 
-import unittest, os
+import unittest, copy, math, os, pickle, shutil, tempfile
+try:
+    # accepts the native str json writes on Python 2 as well
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 from datetime import datetime, date
-import json
-from pytz import timezone, utc
-eastern = timezone('US/Eastern')
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+from pytz import timezone
 
 try:
     from czml import czml
@@ -33,26 +40,46 @@ except ImportError:
 
 from pygeoif import geometry
 
+# colours passed to the constructors. Billboard, SolidColor, Grid and the
+# polyline materials keep the dict they are given, those get a deep copy
+# so no test can leak changes into another.
+GREEN = {'rgba': [0, 255, 127, 55]}
+BLUE = {'rgba': [0, 55, 127, 255]}
+
 
 class BaseClassesTestCase(unittest.TestCase):
 
+    y2k = datetime(2000, 1, 1)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.eastern = timezone('US/Eastern')
+        cls.point01 = geometry.Point(0, 1)
+        cls.point012 = geometry.Point(0, 1, 2)
+        cls.now = datetime.now()
+        cls.now_iso = cls.now.isoformat()
+        cls.est_now = cls.eastern.localize(cls.now)
+        cls.today = cls.now.date()
+        cls.today_iso = cls.today.isoformat()
+        cls.utcnow = datetime.utcnow()
+        cls.utcnow_iso = cls.utcnow.isoformat()
+
     def testDateTimeAware(self):
 
         dtob = czml._DateTimeAware()
-        now = datetime.now()
-        est_now = eastern.localize(now)
-        utcnow = datetime.utcnow()
-        today = now.date()
-        dtob.epoch = now
-        self.assertEqual(dtob.epoch, now.isoformat())
-        dtob.epoch = now.isoformat()
-        self.assertEqual(dtob.epoch, now.isoformat())
+        est_now = self.est_now
+        dtob.epoch = self.now
+        self.assertEqual(dtob.epoch, self.now_iso)
+        dtob.epoch = self.now_iso
+        self.assertEqual(dtob.epoch, self.now_iso)
         dtob.epoch = est_now.isoformat()
         self.assertEqual(dtob.epoch, est_now.isoformat())
-        dtob.epoch = today
-        self.assertEqual(dtob.epoch, today.isoformat())
-        dtob.epoch = utcnow
-        self.assertEqual(dtob.epoch, utcnow.isoformat())
+        dtob.epoch = self.today
+        self.assertEqual(dtob.epoch, self.today_iso)
+        dtob.epoch = self.utcnow
+        self.assertEqual(dtob.epoch, self.utcnow_iso)
+        dtob.epoch = '2013-02-18T01:00:00Z'
+        self.assertEqual(dtob.epoch, '2013-02-18T01:00:00+00:00')
         dtob.epoch = None
         self.assertEqual(dtob.epoch, None)
         # Cannot assign an integer to epoch (no offsets allowed)
@@ -63,14 +90,14 @@ class BaseClassesTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             dtob.epoch = 2.0
         self.assertRaises(ValueError, setattr, dtob, 'epoch', 2.0)
-        dtob.nextTime = now
-        self.assertEqual(dtob.nextTime, now.isoformat())
-        dtob.nextTime = now.isoformat()
-        self.assertEqual(dtob.nextTime, now.isoformat())
-        dtob.nextTime = utcnow
-        self.assertEqual(dtob.nextTime, utcnow.isoformat())
-        dtob.nextTime = today
-        self.assertEqual(dtob.nextTime, today.isoformat())
+        dtob.nextTime = self.now
+        self.assertEqual(dtob.nextTime, self.now_iso)
+        dtob.nextTime = self.now_iso
+        self.assertEqual(dtob.nextTime, self.now_iso)
+        dtob.nextTime = self.utcnow
+        self.assertEqual(dtob.nextTime, self.utcnow_iso)
+        dtob.nextTime = self.today
+        self.assertEqual(dtob.nextTime, self.today_iso)
         dtob.nextTime = 1
         self.assertEqual(dtob.nextTime, 1.0)
         dtob.nextTime = '2'
@@ -78,14 +105,14 @@ class BaseClassesTestCase(unittest.TestCase):
         dtob.nextTime = None
         self.assertEqual(dtob.nextTime, None)
 
-        dtob.previousTime = now
-        self.assertEqual(dtob.previousTime, now.isoformat())
-        dtob.previousTime = now.isoformat()
-        self.assertEqual(dtob.previousTime, now.isoformat())
-        dtob.previousTime = utcnow
-        self.assertEqual(dtob.previousTime, utcnow.isoformat())
-        dtob.previousTime = today
-        self.assertEqual(dtob.previousTime, today.isoformat())
+        dtob.previousTime = self.now
+        self.assertEqual(dtob.previousTime, self.now_iso)
+        dtob.previousTime = self.now_iso
+        self.assertEqual(dtob.previousTime, self.now_iso)
+        dtob.previousTime = self.utcnow
+        self.assertEqual(dtob.previousTime, self.utcnow_iso)
+        dtob.previousTime = self.today
+        self.assertEqual(dtob.previousTime, self.today_iso)
         dtob.previousTime = 1
         self.assertEqual(dtob.previousTime, 1.0)
         dtob.previousTime = '2'
@@ -98,14 +125,24 @@ class BaseClassesTestCase(unittest.TestCase):
         dtob.loads(jst)
         self.assertEqual(dtob.previousTime, 1.0)
         self.assertEqual(dtob.nextTime, 2.0)
-        self.assertEqual(dtob.data(), json.loads(jst))
+        self.assertEqual(dtob.data(), {'nextTime': 2, 'previousTime': 1,
+                                       'epoch': '2013-02-18T00:00:00'})
 
         # Here's a time that comes in as GMT-5.  The representation should be
         # passed through
         est_jst = ('{"nextTime": 2.0, "previousTime": 1,'
                    ' "epoch": "2013-02-18T01:00:00-05:00"}')
         dtob.loads(est_jst)
-        self.assertEqual(dtob.data(), json.loads(est_jst))
+        self.assertEqual(dtob.data(), {'nextTime': 2.0, 'previousTime': 1,
+                                       'epoch': '2013-02-18T01:00:00-05:00'})
+
+        # dateutil completes a bare time with today's date, so it must
+        # not come from the cache of ISO 8601 strings
+        before = date.today().isoformat()
+        dtob.epoch = '10:00'
+        after = date.today().isoformat()
+        self.assertIn(dtob.epoch[:10], (before, after))
+        self.assertIsNone(czml._parse_iso8601('10:00'))
 
     def testCoordinates(self):
 
@@ -121,50 +158,70 @@ class BaseClassesTestCase(unittest.TestCase):
         self.assertEqual(coord.coords[0].y, 1)
         self.assertEqual(coord.coords[0].z, 2)
         self.assertEqual(coord.coords[0].t, None)
-        now = datetime.now()
-        coord = czml._Coordinates([now, 0, 1, 2])
+        coord = czml._Coordinates([self.now, 0, 1, 2])
         self.assertEqual(len(coord.coords), 1)
         self.assertEqual(coord.coords[0].x, 0)
         self.assertEqual(coord.coords[0].y, 1)
         self.assertEqual(coord.coords[0].z, 2)
-        self.assertEqual(coord.coords[0].t, now)
-        y2k = datetime(2000, 1, 1)
-        coord = czml._Coordinates([now, 0, 1, 2, y2k, 3, 4, 5])
+        self.assertEqual(coord.coords[0].t, self.now)
+        coord = czml._Coordinates([self.now, 0, 1, 2, self.y2k, 3, 4, 5])
         self.assertEqual(len(coord.coords), 2)
         self.assertEqual(coord.coords[0].x, 0)
         self.assertEqual(coord.coords[0].y, 1)
         self.assertEqual(coord.coords[0].z, 2)
-        self.assertEqual(coord.coords[0].t, now)
+        self.assertEqual(coord.coords[0].t, self.now)
         self.assertEqual(coord.coords[1].x, 3)
         self.assertEqual(coord.coords[1].y, 4)
         self.assertEqual(coord.coords[1].z, 5)
-        self.assertEqual(coord.coords[1].t, y2k)
-        coord = czml._Coordinates([now, 0, 1, 2, 6, 3, 4, 5])
+        self.assertEqual(coord.coords[1].t, self.y2k)
+        coord = czml._Coordinates([self.now, 0, 1, 2, 6, 3, 4, 5])
         self.assertEqual(coord.coords[1].t, 6)
-        coord = czml._Coordinates([now.isoformat(), 0, 1, 2, '6', 3, 4, 5])
+        self.assertRaises(ValueError, czml._Coordinates, [self.now, 0, 1, 2, 6])
+        coord = czml._Coordinates([self.now_iso, 0, 1, 2, '6', 3, 4, 5])
         self.assertEqual(coord.coords[1].t, 6)
-        self.assertEqual(coord.coords[0].t, now)
-        p = geometry.Point(0, 1)
+        self.assertEqual(coord.coords[0].t, self.now)
+        p = self.point01
         coord = czml._Coordinates(p)
         self.assertEqual(coord.coords[0].x, 0)
         self.assertEqual(coord.coords[0].y, 1)
-        coord = czml._Coordinates([now, p])
+        coord = czml._Coordinates([self.now, p])
         self.assertEqual(coord.coords[0].x, 0)
         self.assertEqual(coord.coords[0].y, 1)
-        self.assertEqual(coord.coords[0].t, now)
-        p1 = geometry.Point(0, 1, 2)
-        coord = czml._Coordinates([now, p, y2k, p1])
+        self.assertEqual(coord.coords[0].t, self.now)
+        p1 = self.point012
+        coord = czml._Coordinates([self.now, p, self.y2k, p1])
         self.assertEqual(coord.coords[0].x, 0)
         self.assertEqual(coord.coords[0].y, 1)
         self.assertEqual(coord.coords[0].z, 0)
-        self.assertEqual(coord.coords[0].t, now)
+        self.assertEqual(coord.coords[0].t, self.now)
         self.assertEqual(coord.coords[1].x, 0)
         self.assertEqual(coord.coords[1].y, 1)
         self.assertEqual(coord.coords[1].z, 2)
-        self.assertEqual(coord.coords[1].t, y2k)
-
-        self.assertEqual(coord.data(), [now.isoformat(), 0, 1, 0,
-                                        y2k.isoformat(), 0, 1, 2])
+        self.assertEqual(coord.coords[1].t, self.y2k)
+
+        self.assertEqual(coord.data(), [self.now_iso, 0, 1, 0,
+                                        self.y2k.isoformat(), 0, 1, 2])
+
+    def testCoordinatesBulk(self):
+
+        n = 1000
+        samples = [(float(i), i * 0.5, i * 0.25, i * 0.125) for i in range(n)]
+        flat = [v for sample in samples for v in sample]
+        coord = czml._Coordinates(flat)
+        self.assertEqual(len(coord.coords), n)
+        self.assertEqual([c.t for c in coord.coords], [s[0] for s in samples])
+        self.assertEqual([c.x for c in coord.coords], [s[1] for s in samples])
+        self.assertEqual([c.y for c in coord.coords], [s[2] for s in samples])
+        self.assertEqual([c.z for c in coord.coords], [s[3] for s in samples])
+        self.assertEqual(coord.data(), flat)
+        # data() hands out a fresh list each time
+        coord.data().append(0)
+        self.assertEqual(coord.data(), flat)
+        # the samples are built once and rebuilt after assigning new ones
+        self.assertIs(coord.coords, coord.coords)
+        coord.coords = coord.coords[:2]
+        self.assertEqual(len(coord.coords), 2)
+        self.assertEqual(coord.data(), flat[:8])
 
 
     def testScale(self):
@@ -178,19 +235,17 @@ class BaseClassesTestCase(unittest.TestCase):
         self.assertEqual(col.rgba, [0, 255, 127, 1])
         col.rgba = [0, 255, 127, 55]
         self.assertEqual(col.rgba, [0, 255, 127, 55])
-        now = datetime.now()
-        col.rgba = [now, 0, 255, 127, 55]
-        self.assertEqual(col.rgba, [now.isoformat(), 0, 255, 127, 55])
-        y2k = datetime(2000, 1, 1)
-        col.rgba = [now, 0, 255, 127, 55, y2k.isoformat(), 5, 6, 7, 8]
-        self.assertEqual(col.rgba, [now.isoformat(), 0, 255, 127, 55,
-                                    y2k.isoformat(), 5, 6, 7, 8])
+        col.rgba = [self.now, 0, 255, 127, 55]
+        self.assertEqual(col.rgba, [self.now_iso, 0, 255, 127, 55])
+        col.rgba = [self.now, 0, 255, 127, 55, self.y2k.isoformat(), 5, 6, 7, 8]
+        self.assertEqual(col.rgba, [self.now_iso, 0, 255, 127, 55,
+                                    self.y2k.isoformat(), 5, 6, 7, 8])
         col.rgba = [1, 0, 255, 127, 55, 2, 5, 6, 7, 8]
         self.assertEqual(col.rgba, [1, 0, 255, 127, 55,
                                     2, 5, 6, 7, 8])
-        col.rgbaf = [now, 0, 0.255, 0.127, 0.55, y2k.isoformat(), 0.5, 0.6, 0.7, 0.8]
-        self.assertEqual(col.rgbaf, [now.isoformat(), 0.0, 0.255, 0.127, 0.55,
-                                    y2k.isoformat(), 0.5, 0.6, 0.7, 0.8])
+        col.rgbaf = [self.now, 0, 0.255, 0.127, 0.55, self.y2k.isoformat(), 0.5, 0.6, 0.7, 0.8]
+        self.assertEqual(col.rgbaf, [self.now_iso, 0.0, 0.255, 0.127, 0.55,
+                                    self.y2k.isoformat(), 0.5, 0.6, 0.7, 0.8])
         col2 = czml.Color()
         col2.loads(col.dumps())
         self.assertEqual(col.data(), col2.data())
@@ -210,6 +265,11 @@ class BaseClassesTestCase(unittest.TestCase):
         self.assertEqual(ashex(col), (60, 60, 60, 60))
         col = 'abc'
         self.assertEqual(ashex(col), (170, 187, 204, 60))
+        self.assertEqual(ashex(col, opacity='ff'), (170, 187, 204, 255))
+        # a longer opacity must not spill into the blue channel
+        self.assertEqual(ashex(col, opacity='fff'), (170, 187, 204, 255))
+        col = 'aabbcc'
+        self.assertEqual(ashex(col, opacity='fff'), (170, 187, 204, 255))
         col = 'ffFF'
         self.assertEqual(ashex(col), (255, 255, 255, 255))
         col = 'ab'
@@ -218,14 +278,23 @@ class BaseClassesTestCase(unittest.TestCase):
         self.assertRaises(ValueError, ashex, col)
         col = 'abcde'
         self.assertRaises(ValueError, ashex, col)
+        col = '0x12'
+        self.assertRaises(ValueError, ashex, col)
         col = ''
         self.assertRaises(ValueError, ashex, col)
         col = None
         self.assertRaises(AttributeError, ashex, col)
+        # the uncached function stays reachable
+        self.assertEqual(ashex.__wrapped__('abc'), (170, 187, 204, 60))
 
 
 class CzmlClassesTestCase(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.now = datetime.now()
+        cls.now_iso = cls.now.isoformat()
+
     def testDocument(self):
 
         # Create a new document packet
@@ -256,65 +325,79 @@ class CzmlClassesTestCase(unittest.TestCase):
         label.show = True
         label_packet.label = label
         doc.packets.append(label_packet)
-        test_filename = 'test.czml'
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        test_filename = os.path.join(tmp, 'test.czml')
         doc.write(test_filename)
         with open(test_filename, 'r') as test_file:
             doc2 = czml.CZML()
             doc2.loads(test_file.read())
-            self.assertEqual(doc.dumps(), doc2.dumps())
-        os.remove(test_filename)
-
-    def testPosition(self):
-
-        pos = czml.Position()
-        now = datetime.now()
-        pos.epoch = now
+            self.assertEqual(list(doc.data()), list(doc2.data()))
+
+        # Streaming a document to a file like object gives the same JSON
+        buf = StringIO()
+        doc.dump(buf)
+        self.assertEqual(buf.getvalue(), doc.dumps())
+        for kwargs in ({'separators': (',', ':')}, {'indent': 2},
+                       {'sort_keys': True}):
+            buf = StringIO()
+            doc.dump(buf, **kwargs)
+            self.assertEqual(buf.getvalue(), doc.dumps(**kwargs))
+
+        # write() takes file like objects too
+        buf = StringIO()
+        doc.write(buf)
+        doc2 = czml.CZML()
+        doc2.loads(buf.getvalue())
+        self.assertEqual(list(doc.data()), list(doc2.data()))
+
+        # NaN written by the json module can be read back
+        nan_packet = czml.CZMLPacket(id='nan')
+        nan_packet.position = czml.Position(cartesian=[float('nan'), 0, 0])
+        doc = czml.CZML([nan_packet])
+        doc2 = czml.CZML()
+        doc2.loads(doc.dumps(indent=1))
+        cartesian = list(doc2.data())[0]['position']['cartesian']
+        self.assertTrue(math.isnan(cartesian[0]))
+        self.assertEqual(cartesian[1:], [0, 0])
+
+    def _check_position(self, cls, fields):
+        """ fields are (property set, key it shows up under in data())
+        pairs, the first one is checked against the complete packet """
         coords = [7.0, 0.0, 1.0, 2.0, 6.0, 3.0, 4.0, 5.0]
-        pos.cartographicRadians = coords
-        self.assertEqual(pos.data()['cartographicRadians'],
-            coords)
-
-        js = {'epoch': now.isoformat(), 'cartographicRadians': coords}
+        pos = cls()
+        pos.epoch = self.now
+        field, key = fields[0]
+        setattr(pos, field, coords)
+        self.assertEqual(pos.data()[key], coords)
+        js = {'epoch': self.now_iso, key: coords}
         self.assertEqual(pos.data(), js)
-        self.assertEqual(pos.dumps(), json.dumps(js))
-        pos.cartographicDegrees = coords
-        self.assertEqual(pos.data()['cartographicDegrees'],
-            coords)
-
-        pos.cartesian = coords
-        self.assertEqual(pos.data()['cartesian'],
-            coords)
-        pos2 = czml.Position()
-        pos2.loads(pos.dumps())
-        self.assertEqual(pos.data(), pos2.data())
-
-    def testRadii(self):
-
-        pos = czml.Radii()
-        now = datetime.now()
-        pos.epoch = now
-        coords = [7.0, 0.0, 1.0, 2.0, 6.0, 3.0, 4.0, 5.0]
-        pos.cartesian = coords
-        self.assertEqual(pos.data()['cartesian'],
-            coords)
-
-        js = {'epoch': now.isoformat(), 'cartesian': coords}
-        self.assertEqual(pos.data(), js)
-        self.assertEqual(pos.dumps(), json.dumps(js))
+        self.assertEqual(loads(pos.dumps()), js)
 
-        pos.cartographicDegrees = coords
-        self.assertEqual(pos.data()['cartesian'],
-            coords)
+        for field, key in fields[1:]:
+            setattr(pos, field, coords)
+            self.assertEqual(pos.data()[key], coords)
 
-        pos2 = czml.Radii()
+        pos2 = cls()
         pos2.loads(pos.dumps())
         self.assertEqual(pos.data(), pos2.data())
 
+    def testPosition(self):
+        self._check_position(czml.Position,
+                             [('cartographicRadians', 'cartographicRadians'),
+                              ('cartographicDegrees', 'cartographicDegrees'),
+                              ('cartesian', 'cartesian')])
+
+    def testRadii(self):
+        self._check_position(czml.Radii,
+                             [('cartesian', 'cartesian'),
+                              ('cartographicDegrees', 'cartesian')])
+
     def testPoint(self):
 
         # Create a new point
         point = czml.Point()
-        point.color = {'rgba': [0, 255, 127, 55]}
+        point.color = GREEN
         self.assertEqual(point.data(), {'color':
                 {'rgba': [0, 255, 127, 55]},
                 'show': False})
@@ -379,7 +462,7 @@ class CzmlClassesTestCase(unittest.TestCase):
         # Create a new billboard
         bb = czml.Billboard(show=True, scale=0.7)
         bb.image = 'http://localhost/img.png'
-        bb.color = {'rgba': [0, 255, 127, 55]}
+        bb.color = copy.deepcopy(GREEN)
         self.assertEqual(bb.data(), {'image': 'http://localhost/img.png',
                                      'scale': 0.7,
                                      'color': {'rgba': [0, 255, 127, 55]},
@@ -410,6 +493,10 @@ class CzmlClassesTestCase(unittest.TestCase):
                                                        'show': False},
                                          })
 
+        # Only keyword arguments are accepted
+        self.assertRaises(TypeError, czml.Billboard, 'http://localhost/img.png')
+        self.assertRaises(ValueError, czml.Billboard, bad_data=None)
+
     def testClock(self):
 
         # Create a new clock (inside a document packet)
@@ -580,6 +667,7 @@ class CzmlClassesTestCase(unittest.TestCase):
         v.cartographicRadians = [0.0, 0.0, .0, 1.0, 1.0, 1.0]
         self.assertEqual(v.data(), {'cartographicRadians':
             [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]})
+        self.assertIsInstance(v.data()['cartographicRadians'], list)
 
         # Create a new positions from an existing positions
         v2 = czml.Positions()
@@ -589,7 +677,7 @@ class CzmlClassesTestCase(unittest.TestCase):
     def testPath(self):
 
         # Create a new path
-        sc = czml.SolidColor(color={'rgba': [0, 255, 127, 55]})
+        sc = czml.SolidColor(color=copy.deepcopy(GREEN))
         m1 = czml.Material(solidColor=sc)
         c1 = [0, -62, 141, 0,
               2, -51, 143, 0,
@@ -616,8 +704,8 @@ class CzmlClassesTestCase(unittest.TestCase):
         self.assertEqual(p2.data(), p1.data())
 
         # Modify an existing path
-        po = czml.PolylineOutline(color={'rgba': [0, 255, 127, 55]},
-                                  outlineColor={'rgba': [0, 55, 127, 255]},
+        po = czml.PolylineOutline(color=copy.deepcopy(GREEN),
+                                  outlineColor=copy.deepcopy(BLUE),
                                   outlineWidth=4)
         m2 = czml.Material(polylineOutline=po)
         c2 = [0, 1000, 7500, 90,
@@ -664,7 +752,7 @@ class CzmlClassesTestCase(unittest.TestCase):
     def testPolyline(self):
 
         # Create a new polyline
-        sc = czml.SolidColor(color={'rgba': [0, 255, 127, 55]})
+        sc = czml.SolidColor(color=copy.deepcopy(GREEN))
         m1 = czml.Material(solidColor=sc)
         c1 = geometry.LineString([(-162, 41, 0), (-151, 43, 0), (-140, 45, 0)])
         v1 = czml.Positions(cartographicDegrees=c1)
@@ -682,7 +770,7 @@ class CzmlClassesTestCase(unittest.TestCase):
                                      })
 
         # Create a new polyline
-        pg = czml.PolylineGlow(color={'rgba': [0, 255, 127, 55]}, glowPower=0.25)
+        pg = czml.PolylineGlow(color=copy.deepcopy(GREEN), glowPower=0.25)
         m2 = czml.Material(polylineGlow=pg)
         c2 = geometry.LineString([(1.6, 5.3, 10), (2.4, 4.2, 20), (3.8, 3.1, 30)])
         v2 = czml.Positions(cartographicRadians=c2)
@@ -705,8 +793,8 @@ class CzmlClassesTestCase(unittest.TestCase):
         self.assertEqual(p3.data(), p2.data())
 
         # Modify an existing polyline
-        po = czml.PolylineOutline(color={'rgba': [0, 255, 127, 55]},
-                                  outlineColor={'rgba': [0, 55, 127, 255]},
+        po = czml.PolylineOutline(color=copy.deepcopy(GREEN),
+                                  outlineColor=copy.deepcopy(BLUE),
                                   outlineWidth=4)
         m3 = czml.Material(polylineOutline=po)
         c3 = geometry.LineString([(1000, 7500, 90), (2000, 6500, 50), (3000, 5500, 20)])
@@ -752,7 +840,7 @@ class CzmlClassesTestCase(unittest.TestCase):
         mat = czml.Material(image=img)
         pts = geometry.LineString([(50, 20, 2), (60, 30, 3), (50, 30, 4), (60, 20, 5)])
         pos = czml.Positions(cartographicDegrees=pts)
-        col = {'rgba': [0, 255, 127, 55]}
+        col = GREEN
         pol = czml.Polygon(show=True, material=mat, positions=pos, perPositionHeight=True,
                            fill=True, outline=True, outlineColor=col)
         self.assertEqual(pol.data(), {'show': True, 'fill': True, 'outline': True,
@@ -776,7 +864,7 @@ class CzmlClassesTestCase(unittest.TestCase):
         self.assertEqual(pol2.data(), pol.data())
 
         # Modify an existing polygon
-        grid = czml.Grid(color={'rgba': [0, 55, 127, 255]}, cellAlpha=0.4,
+        grid = czml.Grid(color=copy.deepcopy(BLUE), cellAlpha=0.4,
                          lineCount=5, lineThickness=2, lineOffset=0.3)
         mat2 = czml.Material(grid=grid)
         pts2 = geometry.LineString([(1.5, 1.2, 0), (1.6, 1.3, 0), (1.5, 1.3, 0), (1.6, 1.2, 0)])
@@ -838,7 +926,7 @@ class CzmlClassesTestCase(unittest.TestCase):
         pts1 = [50, 20, 2]
         pos1 = czml.Position(cartographicDegrees=pts1)
         ell1 = czml.Ellipse(show=True, fill=True, height=50, extrudedHeight=200,
-                            outline=True, outlineColor={'rgba': [0, 255, 127, 55]},
+                            outline=True, outlineColor=GREEN,
                             semiMajorAxis=150, semiMinorAxis=75, numberOfVerticalLines=800,
                             rotation=1.2, material=mat1, position=pos1)
 
@@ -944,14 +1032,12 @@ class CzmlClassesTestCase(unittest.TestCase):
         ellipsoid_value['material'] = 2
         with self.assertRaises(TypeError):
             czml.Ellipsoid(**ellipsoid_value)
-        self.assertRaises(TypeError, czml.Ellipsoid, **ellipsoid_value)
 
         # Verify you can't create ellipsoids with nonsensical radii
         ellipsoid_value['material'] = {}
         ellipsoid_value['radii'] = 5
         with self.assertRaises(TypeError):
             czml.Ellipsoid(**ellipsoid_value)
-        self.assertRaises(TypeError, czml.Ellipsoid, **ellipsoid_value)
 
         # Add an ellipsoid to a CZML packet
         packet = czml.CZMLPacket(id='abc')
@@ -967,7 +1053,7 @@ class CzmlClassesTestCase(unittest.TestCase):
     def testCone(self):
 
         # Create a new cone
-        sc = czml.SolidColor(color={'rgba': [0, 255, 127, 55]})
+        sc = czml.SolidColor(color=copy.deepcopy(GREEN))
         mat = czml.Material(solidColor=sc)
         c = czml.Cone(show=True,
                       innerMaterial=mat,
@@ -994,6 +1080,14 @@ class CzmlClassesTestCase(unittest.TestCase):
         # Verify passing in an unknown value raises a ValueError
         with self.assertRaises(ValueError):
             c3 = czml.Cone(bad_data=None)
+        # epoch, nextTime and previousTime may be passed by position
+        c3 = czml.Cone(self.now, 1.0, 2.0)
+        self.assertEqual(c3.data(), {'epoch': self.now_iso, 'nextTime': 1.0,
+                                     'previousTime': 2.0, 'show': True})
+        self.assertEqual(czml.Cone(self.now).data(),
+                         {'epoch': self.now_iso, 'show': True})
+        # the remaining properties are keyword only
+        self.assertRaises(TypeError, czml.Cone, self.now, 1.0, 2.0, True)
 
         # Add a cone to a CZML packet
         packet = czml.CZMLPacket(id='abc')
@@ -1009,6 +1103,19 @@ class CzmlClassesTestCase(unittest.TestCase):
                                                   },
                                          })
 
+    def testPickle(self):
+        packet = czml.CZMLPacket(id='abc')
+        packet.billboard = czml.Billboard(show=True,
+                                          color=copy.deepcopy(GREEN))
+        packet.position = czml.Position(epoch=self.now,
+                                        cartographicDegrees=[0, 1, 2, 3])
+        packet.polygon = czml.Polygon(
+            positions=czml.Positions(cartesian=[0, 1, 2, 3, 4, 5]),
+            material=czml.Material(solidColor={'color': copy.deepcopy(BLUE)}))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            packet2 = pickle.loads(pickle.dumps(packet, protocol))
+            self.assertEqual(packet2.data(), packet.data())
+
     def testDescription(self):
         packet = czml.CZMLPacket(id='the_id')
         packet.description = '<h1>Hello World</h1>'
@@ -1019,10 +1126,5 @@ class CzmlClassesTestCase(unittest.TestCase):
         self.assertEqual(packet.data(), {'id': 'the_id', 'description': 'As a dict'})
 
 
-def test_suite():
-    suite = unittest.TestSuite()
-    suite.addTest(unittest.makeSuite(BaseClassesTestCase))
-    return suite
-
 if __name__ == '__main__':
     unittest.main()
@@ -15,22 +15,88 @@
 #    License along with this library; if not, write to the Free Software
 #    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 
-def hexcolor_to_rgba(color, opacity='3c'):
+import re
+try:
+    from functools import lru_cache
+except ImportError:
+    # Python 2
+    def lru_cache(maxsize=128):
+        def decorator(function):
+            function.__wrapped__ = function
+            return function
+        return decorator
+
+# validates the digits and strips the optional '#' in a single match
+_match_hexcolor = re.compile(
+    r'\A#?([0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})\Z').match
+
+_DEFAULT_OPACITY = '3c'
+_DEFAULT_ALPHA = int(_DEFAULT_OPACITY, 16)
+
+
+def _alpha(opacity):
+    """ The opacity as an integer, parsed only when it is not the default.
+    Like the colour digits only its first two digits are used. """
+    if opacity == _DEFAULT_OPACITY:
+        return _DEFAULT_ALPHA
+    return int(opacity[:2], 16)
+
+
+# Each expander takes the hex digits and returns the (R, G, B, A) tuple.
+# The long forms let bytearray.fromhex decode the digits straight into
+# bytes. The short forms spread their nibbles one byte apart and multiply
+# by 0x11 to copy every nibble into both halves of its byte (SWAR),
+# 0xabc becomes 0xaabbcc.
+
+def _unpack(rgba):
+    return (rgba >> 24, rgba >> 16 & 0xff, rgba >> 8 & 0xff, rgba & 0xff)
+
+
+def _expand_rgb(color, opacity):
+    v = int(color, 16)
+    v = ((v & 0xf00) << 8 | (v & 0xf0) << 4 | (v & 0xf)) * 0x11
+    return _unpack(v << 8 | _alpha(opacity))
+
+
+def _expand_rgba(color, opacity):
+    v = int(color, 16)
+    return _unpack(((v & 0xf000) << 12 | (v & 0xf00) << 8 |
+                    (v & 0xf0) << 4 | (v & 0xf)) * 0x11)
+
+
+def _expand_rrggbb(color, opacity):
+    raw = bytearray.fromhex(color)
+    return (raw[0], raw[1], raw[2], _alpha(opacity))
+
+
+def _expand_rrggbbaa(color, opacity):
+    raw = bytearray.fromhex(color)
+    return (raw[0], raw[1], raw[2], raw[3])
+
+
+# number of hex digits -> function expanding them into (R, G, B, A)
+_LEN_DISPATCH = {
+    3: _expand_rgb,
+    4: _expand_rgba,
+    6: _expand_rrggbb,
+    8: _expand_rrggbbaa,
+}
+
+
+# Documents tend to reuse a small palette, so repeated colours are served
+# from the cache. Callers with many unique colours can use
+# hexcolor_to_rgba.__wrapped__ to bypass it. The arguments are the cache
+# key, so unhashable input such as a list raises TypeError.
+@lru_cache(maxsize=1024)
+def hexcolor_to_rgba(color, opacity=_DEFAULT_OPACITY):
     """ convert a web hexadecimal [#]RRGGBB[AA] color to an (R, G, B, A) tuple """
     color = color.strip()
-    if color.startswith('#'):
-        color = color[1:]
-    tc = int(color, 16) # this raises a value error  if color contains illegal chars
-    if len(color)==3:
-        color =''.join([b*2 for b in color]) + opacity
-    elif len(color)==4:
-        color =''.join([b*2 for b in color])
-    elif len(color)==6:
-        color = color + opacity
-    elif len(color)==8:
-        pass
-    else:
-        raise ValueError("input #%s is not in #RRGGBB[AA] format" % color)
-    r, g, b, a = color[0:2], color[2:4], color[4:6], color[6:8]
-    r, g, b, a = [int(n, 16) for n in (r, g, b, a)]
-    return (r, g, b, a)
+    match = _match_hexcolor(color)
+    if match is None:
+        if color.startswith('#'):
+            color = color[1:]
+        if len(color) not in _LEN_DISPATCH:
+            raise ValueError("input #%s is not in #RRGGBB[AA] format" % color)
+        raise ValueError("input #%s is not a hexadecimal color" % color)
+    digits = match.group(1)
+    return _LEN_DISPATCH[len(digits)](digits, opacity)
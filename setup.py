@@ -1,18 +1,10 @@
-from setuptools import setup, find_packages
-import sys, os
-from setuptools.command.test import test as TestCommand
+from setuptools import setup
+import io, os
 
 
-class PyTest(TestCommand):
-    def finalize_options(self):
-        TestCommand.finalize_options(self)
-        self.test_args = []
-        self.test_suite = True
-    def run_tests(self):
-        #import here, cause outside the eggs aren't loaded
-        import pytest
-        errno = pytest.main(self.test_args)
-        sys.exit(errno)
+def read(*path):
+    with io.open(os.path.join(*path), encoding='utf-8') as f:
+        return f.read()
 
 
 version = '0.3.3'
@@ -20,8 +12,8 @@ version = '0.3.3'
 setup(name='czml',
       version=version,
       description="Read and write CZML in Python",
-      long_description=open('README.rst').read() + "\n" +
-                       open(os.path.join("docs", "HISTORY.txt")).read(),
+      long_description=read('README.rst') + "\n" +
+                       read("docs", "HISTORY.txt"),
     classifiers=[
         "Topic :: Scientific/Engineering :: GIS",
         "Programming Language :: Python",
@@ -41,17 +33,19 @@ setup(name='czml',
       author_email='christian.ledermann@gmail.com',
       url='https://github.com/cleder/czml',
       license='LGPL',
-      packages=find_packages(exclude=['ez_setup', 'examples', 'tests']),
+      packages=['czml'],
       include_package_data=True,
       zip_safe=False,
-      tests_require=['pytest'],
-      cmdclass = {'test': PyTest},
       install_requires=[
           # -*- Extra requirements: -*-
           "pygeoif==0.7",
           'python-dateutil',
           'pytz',
       ],
+      extras_require={
+          'orjson': ['orjson'],
+          'ciso8601': ['ciso8601'],
+      },
       entry_points="""
       # -*- Entry points: -*-
       """,